@@ -1,63 +1,95 @@
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any, Union
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field
 
 class PersonalInfo(BaseModel):
     """Personal information section of a resume"""
-    name: str = Field(description="Full name of the person")
-    email: str = Field(description="Professional email address")
-    phone: str = Field(description="Phone number in standard format")
-    location: str = Field(description="City and state")
-    linkedin: str = Field(description="LinkedIn profile URL")
-    github: Optional[str] = Field(description="GitHub profile URL")
-    portfolio: Optional[str] = Field(description="Personal portfolio website")
+    model_config = ConfigDict(defer_build=True)
+
+    name: str  # Full name of the person
+    email: str  # Professional email address
+    phone: str  # Phone number in standard format
+    location: str  # City and state
+    linkedin: str  # LinkedIn profile URL
+    github: Optional[str] = None  # GitHub profile URL
+    portfolio: Optional[str] = None  # Personal portfolio website
 
 class Experience(BaseModel):
     """Work experience entry"""
-    title: str = Field(description="Job title")
-    company: str = Field(description="Company name")
-    location: str = Field(description="Job location (city, state)")
-    start_date: str = Field(description="Start date of employment")
-    end_date: str = Field(description="End date of employment or 'Present'")
-    responsibilities: List[str] = Field(description="List of job responsibilities and achievements")
-    technologies: List[str] = Field(description="Technologies and tools used")
+    model_config = ConfigDict(defer_build=True)
+
+    title: str  # Job title
+    company: str  # Company name
+    location: str  # Job location (city, state)
+    start_date: str  # Start date of employment
+    end_date: str  # End date of employment or 'Present'
+    responsibilities: List[str]  # List of job responsibilities and achievements
+    technologies: List[str]  # Technologies and tools used
 
 class Education(BaseModel):
     """Education entry"""
-    degree: str = Field(description="Degree type")
-    field: str = Field(description="Field of study")
-    university: str = Field(description="University name")
-    location: str = Field(description="University location")
-    year: int = Field(description="Graduation year")
-    gpa: float = Field(description="GPA on a 4.0 scale")
-    relevant_coursework: List[str] = Field(description="List of relevant courses")
+    model_config = ConfigDict(defer_build=True)
+
+    degree: str  # Degree type
+    field: str  # Field of study
+    university: str  # University name
+    location: str  # University location
+    year: int  # Graduation year
+    gpa: float  # GPA on a 4.0 scale
+    relevant_coursework: List[str]  # List of relevant courses
 
 class Certification(BaseModel):
     """Certification entry"""
-    name: str = Field(description="Name of certification")
-    issuer: str = Field(description="Issuing organization")
-    date: str = Field(description="Date of certification")
+    model_config = ConfigDict(defer_build=True)
+
+    name: str  # Name of certification
+    issuer: Optional[str] = None  # Issuing organization
+    # LLM output is loose here (years as ints, dates as strings), so optional fields take either form
+    date: Optional[Union[int, str]] = None  # Date of certification
+    year: Optional[Union[int, str]] = None  # Year of certification, often given instead of a date
+
+class Publication(BaseModel):
+    """Publication entry"""
+    model_config = ConfigDict(defer_build=True)
+
+    title: str  # Title of the publication
+    # Optional fields also accept strings such as "2021-05", "N/A" or "50+" rather than dropping the resume
+    authors: Optional[Union[List[str], str]] = None  # List of authors
+    journal: Optional[str] = None  # Journal or conference name
+    year: Optional[Union[int, float, str]] = None  # Publication year
+    link: Optional[str] = None  # Link to the publication
+    impact_factor: Optional[Union[int, float, str]] = None  # Journal impact factor
+    citations: Optional[Union[int, float, str]] = None  # Number of citations
+
+class Project(BaseModel):
+    """Research project entry"""
+    model_config = ConfigDict(defer_build=True)
+
+    # There's no project schema in the prompt, so accept 'name' for the title and plain strings for lists
+    title: Optional[str] = Field(default=None, validation_alias=AliasChoices("title", "name"))  # Project title
+    description: Optional[str] = None  # Short project description
+    technologies: Optional[Union[List[str], str]] = None  # Technologies and tools used
+    results: Optional[Union[List[str], str]] = None  # Key results and outcomes
 
 class Resume(BaseModel):
     """Complete resume structure with dynamic sections"""
-    personal_info: PersonalInfo = Field(description="Personal and contact information")
-    summary: str = Field(description="Professional summary")
-    experience: List[Experience] = Field(description="Work experience entries")
-    education: List[Education] = Field(description="Education entries")
-    skills: List[str] = Field(description="List of technical and professional skills")
+    model_config = ConfigDict(extra="allow", defer_build=True)
+
+    personal_info: PersonalInfo  # Personal and contact information
+    summary: str  # Professional summary
+    experience: List[Experience]  # Work experience entries
+    education: List[Education]  # Education entries
+    skills: List[str]  # List of technical and professional skills
     
     # Make all these truly optional
-    publications: Optional[List[Dict[str, Any]]] = Field(None, description="Academic publications")
-    certifications: Optional[List[Dict[str, Any]]] = Field(None, description="Professional certifications")
-    awards: Optional[List[str]] = Field(None, description="Professional awards and recognition")
-    languages: Optional[List[Dict[str, str]]] = Field(None, description="Language proficiencies")
-    projects: Optional[List[Dict[str, Any]]] = Field(None, description="Research project details")
-    portfolio: Optional[List[Dict[str, Any]]] = Field(None, description="Portfolio projects")
-    open_source: Optional[List[Dict[str, Any]]] = Field(None, description="Open source contributions")
-    system_architecture: Optional[List[Dict[str, Any]]] = Field(None, description="System architecture experience")
-    infrastructure: Optional[List[Dict[str, Any]]] = Field(None, description="Infrastructure and DevOps experience")
-    security: Optional[List[Dict[str, Any]]] = Field(None, description="Security expertise")
-    app_store: Optional[List[Dict[str, Any]]] = Field(None, description="App store publications")
-    volunteer: Optional[List[Dict[str, Any]]] = Field(None, description="Volunteer work")
-
-    class Config:
-        extra = "allow" 
\ No newline at end of file
+    publications: Optional[List[Publication]] = None  # Academic publications
+    certifications: Optional[List[Certification]] = None  # Professional certifications
+    awards: Optional[List[str]] = None  # Professional awards and recognition
+    languages: Optional[List[Dict[str, str]]] = None  # Language proficiencies
+    projects: Optional[List[Project]] = None  # Research project details
+    portfolio: Optional[List[Dict[str, Any]]] = None  # Portfolio projects
+    open_source: Optional[List[Dict[str, Any]]] = None  # Open source contributions
+    system_architecture: Optional[List[Dict[str, Any]]] = None  # System architecture experience
+    infrastructure: Optional[List[Dict[str, Any]]] = None  # Infrastructure and DevOps experience
+    security: Optional[List[Dict[str, Any]]] = None  # Security expertise
+    app_store: Optional[List[Dict[str, Any]]] = None  # App store publications
+    volunteer: Optional[List[Dict[str, Any]]] = None  # Volunteer work
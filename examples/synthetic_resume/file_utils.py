@@ -0,0 +1,27 @@
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict
+
+try:
+    # orjson serializes the resume files several times faster than the stdlib
+    import orjson
+except ImportError:
+    orjson = None
+
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^a-z0-9_]')
+
+@lru_cache(maxsize=128)
+def safe_filename(text: str) -> str:
+    """Lowercase text, map spaces to underscores and drop anything else unsafe; cached since roles repeat"""
+    return _UNSAFE_FILENAME_CHARS.sub('', text.lower().replace(' ', '_'))
+
+def write_json(resume_data: Dict, json_path: str) -> None:
+    """Write resume data as indented JSON"""
+    # Encode once and hand the whole payload to a binary file, skipping the text-mode codec and chunked writes
+    if orjson is not None:
+        data = orjson.dumps(resume_data, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(resume_data, indent=2).encode('utf-8')
+    Path(json_path).write_bytes(data)
@@ -1,54 +1,63 @@
-from typing import Dict, Tuple
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping
 
-FONT_STYLES = {
-    "modern": {
+# Read-only views: get_font_style hands out shared (and cached) entries
+FONT_STYLES = MappingProxyType({
+    "modern": MappingProxyType({
         "name": "helvetica",
         "header_size": 14,
         "section_size": 12,
         "body_size": 10,
         "spacing": 5,
-    },
-    "classic": {
+    }),
+    "classic": MappingProxyType({
         "name": "times",
         "header_size": 16,
         "section_size": 13,
         "body_size": 11,
         "spacing": 5,
-    },
-    "minimal": {
+    }),
+    "minimal": MappingProxyType({
         "name": "arial",
         "header_size": 14,
         "section_size": 11,
         "body_size": 10,
         "spacing": 4,
-    },
-    "professional": {
+    }),
+    "professional": MappingProxyType({
         "name": "helvetica",
         "header_size": 15,
         "section_size": 12,
         "body_size": 10,
         "spacing": 5,
-    },
-    "academic": {
+    }),
+    "academic": MappingProxyType({
         "name": "times",
         "header_size": 14,
         "section_size": 12,
         "body_size": 11,
         "spacing": 6,
-    }
-}
+    }),
+})
 
-def get_font_style(role: str) -> Dict:
+# Role terms per style, in priority order: the first style with a matching term wins
+_ROLE_STYLE_TERMS = (
+    ("academic", ("researcher", "scientist", "phd", "professor")),
+    ("professional", ("senior", "lead", "principal", "architect")),
+    ("modern", ("ui", "ux", "designer", "creative")),
+    ("minimal", ("engineer", "developer")),
+)
+
+# One lookahead per style keeps the priority order while matching all terms in a single compiled pattern
+_ROLE_STYLE_PATTERN = re.compile(
+    "|".join(f"(?=.*?(?P<{style}>{'|'.join(terms)}))" for style, terms in _ROLE_STYLE_TERMS),
+    re.DOTALL,
+)
+
+@lru_cache(maxsize=256)
+def get_font_style(role: str) -> Mapping:
     """Return appropriate font style based on role"""
-    role = role.lower()
-    
-    if any(term in role for term in ['researcher', 'scientist', 'phd', 'professor']):
-        return FONT_STYLES["academic"]
-    elif any(term in role for term in ['senior', 'lead', 'principal', 'architect']):
-        return FONT_STYLES["professional"]
-    elif any(term in role for term in ['ui', 'ux', 'designer', 'creative']):
-        return FONT_STYLES["modern"]
-    elif any(term in role for term in ['engineer', 'developer']):
-        return FONT_STYLES["minimal"]
-    else:
-        return FONT_STYLES["classic"] 
\ No newline at end of file
+    match = _ROLE_STYLE_PATTERN.match(role.lower())
+    return FONT_STYLES[match.lastgroup] if match else FONT_STYLES["classic"]
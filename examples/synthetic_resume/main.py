@@ -1,65 +1,86 @@
+import argparse
+import asyncio
+import functools
 import os
 import logging
 from datetime import datetime
-import json
-import re
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional
 from role_generator import RoleGenerator
 from resume_generator import ResumeGenerator
 from name_generator import NameGenerator
 from pdf_generator import create_pdf
+from file_utils import safe_filename, write_json
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Generators are built once per process and shared by every orchestrator
+@functools.cache
+def _role_generator() -> RoleGenerator:
+    return RoleGenerator()
+
+@functools.cache
+def _resume_generator() -> ResumeGenerator:
+    return ResumeGenerator()
+
+@functools.cache
+def _name_generator(seed: Optional[int] = None) -> NameGenerator:
+    return NameGenerator(seed)
+
+def reset_generators() -> None:
+    """Drop the shared generators so the next orchestrator builds fresh ones"""
+    for factory in (_role_generator, _resume_generator, _name_generator):
+        factory.cache_clear()
+
 class ResumeGenerationOrchestrator:
     """Orchestrates the resume generation process"""
     
-    def __init__(self):
-        self.role_generator = RoleGenerator()
-        self.resume_generator = ResumeGenerator()
-        self.name_generator = NameGenerator()
-        
-        # Create base output directory
-        self.base_dir = "generated_resumes"
-        os.makedirs(self.base_dir, exist_ok=True)
-        
-        # Create timestamped directory
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.output_dir = os.path.join(self.base_dir, f"attempt_{timestamp}")
-        os.makedirs(self.output_dir, exist_ok=True)
-        logger.info(f"Created output directory: {self.output_dir}")
+    base_dir = "generated_resumes"
+    # Timestamped output directory, created once and shared by every orchestrator in the process
+    _output_dir: Optional[str] = None
     
-    def generate_resumes(self, num_resumes: int = 5) -> None:
+    def __init__(self, seed: Optional[int] = None):
+        self.role_generator = _role_generator()
+        self.resume_generator = _resume_generator()
+        self.name_generator = _name_generator(seed)
+        self.output_dir = self._ensure_output_dir()
+    
+    @classmethod
+    def _ensure_output_dir(cls) -> str:
+        """Create the base and timestamped output directories on first use"""
+        if cls._output_dir is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_dir = os.path.join(cls.base_dir, f"attempt_{timestamp}")
+            for path in (cls.base_dir, output_dir):
+                # mkdir directly instead of makedirs(exist_ok=True) to skip the extra stat
+                try:
+                    os.mkdir(path)
+                except FileExistsError:
+                    pass
+            cls._output_dir = output_dir
+            logger.info(f"Created output directory: {output_dir}")
+        return cls._output_dir
+    
+    async def generate_resumes(self, num_resumes: int = 5) -> None:
         """Generate specified number of resumes"""
         successful = 0
         try:
             variations = self.role_generator.get_variations(num_resumes)
+            for variation, unique_name in zip(variations, self.name_generator.get_unique_names(len(variations))):
+                variation['name'] = unique_name
             
-            for i, variation in enumerate(variations, 1):
-                try:
-                    unique_name = self.name_generator.get_unique_name()
-                    variation['name'] = unique_name
-                    
-                    resume_data = self.resume_generator([{'role_variation': variation}])
-                    if not resume_data or len(resume_data) == 0:
-                        logger.error(f"No data generated for resume {i}")
-                        continue
-                    
-                    resume = resume_data[0]
-                    resume["personal_info"]["name"] = unique_name
-                    
-                    # Generate filenames
-                    safe_name = self._get_safe_filename(unique_name)
-                    role_name = self._get_safe_filename(variation['role'])
-                    
-                    # Save files
-                    if self._save_resume_files(resume, safe_name, role_name):
-                        successful += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error generating resume {i}: {str(e)}")
-                    continue
+            # Submit every variation as one batch so curator can pipeline the requests
+            resumes = await asyncio.to_thread(self.resume_generator, [{'role_variation': v} for v in variations])
+            
+            # PDF rendering is CPU-bound Python, so it runs in worker processes rather than fighting over the GIL;
+            # the pool is shut down once this batch is saved
+            with ProcessPoolExecutor() as pdf_pool:
+                tasks = [
+                    asyncio.create_task(self._handle_resume(i, variation, resume, pdf_pool))
+                    for i, (variation, resume) in enumerate(zip(variations, resumes), 1)
+                ]
+                successful = sum(await asyncio.gather(*tasks))
                 
         except Exception as e:
             logger.error(f"Error in resume generation: {str(e)}")
@@ -69,22 +90,41 @@ class ResumeGenerationOrchestrator:
             logger.info(f"Successfully generated {successful} out of {num_resumes} resumes")
             logger.info(f"Files are saved in: {self.output_dir}")
 
-    def _get_safe_filename(self, text: str) -> str:
-        """Generate safe filename from text"""
-        return re.sub(r'[^a-z0-9_]', '', text.lower().replace(' ', '_'))
+    async def _handle_resume(self, i: int, variation: dict, resume: Optional[dict], pdf_pool: ProcessPoolExecutor) -> bool:
+        """Save a single generated resume, returning success status"""
+        try:
+            if resume is None:
+                logger.error(f"No data generated for resume {i}")
+                return False
+            
+            unique_name = variation['name']
+            resume["personal_info"]["name"] = unique_name
+            
+            # Generate filenames
+            safe_name = safe_filename(unique_name)
+            role_name = safe_filename(variation['role'])
+            
+            # Save files
+            return await self._save_resume_files(resume, safe_name, role_name, pdf_pool)
+                
+        except Exception as e:
+            logger.error(f"Error generating resume {i}: {str(e)}")
+            return False
 
-    def _save_resume_files(self, resume: dict, safe_name: str, role_name: str) -> bool:
-        """Save resume files and return success status"""
+    async def _save_resume_files(self, resume: dict, safe_name: str, role_name: str, pdf_pool: ProcessPoolExecutor) -> bool:
+        """Save resume files off the event loop and return success status"""
+        json_path = os.path.join(self.output_dir, f"resume_{safe_name}_{role_name}.json")
+        pdf_path = os.path.join(self.output_dir, f"resume_{safe_name}_{role_name}.pdf")
         try:
-            # Save JSON
-            json_path = os.path.join(self.output_dir, f"resume_{safe_name}_{role_name}.json")
-            with open(json_path, 'w') as f:
-                json.dump(resume, f, indent=2)
+            # Write JSON and render PDF in the background; the small JSON writes go to the loop's default thread pool
+            loop = asyncio.get_running_loop()
+            _, pdf_created = await asyncio.gather(
+                asyncio.to_thread(write_json, resume, json_path),
+                loop.run_in_executor(pdf_pool, create_pdf, resume, pdf_path),
+            )
             logger.info(f"Saved JSON to: {json_path}")
             
-            # Generate PDF
-            pdf_path = os.path.join(self.output_dir, f"resume_{safe_name}_{role_name}.pdf")
-            if create_pdf(resume, pdf_path):
+            if pdf_created:
                 logger.info(f"Created PDF: {pdf_path}")
                 return True
                 
@@ -97,13 +137,14 @@ class ResumeGenerationOrchestrator:
 
 def main():
     """Main entry point"""
-    import argparse
     parser = argparse.ArgumentParser(description='Generate synthetic resumes')
     parser.add_argument('--num', type=int, default=5, help='Number of resumes to generate')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Seed for name assignment; rerunning with the same seed and --num reuses cached LLM responses')
     args = parser.parse_args()
     
-    orchestrator = ResumeGenerationOrchestrator()
-    orchestrator.generate_resumes(num_resumes=args.num)
+    orchestrator = ResumeGenerationOrchestrator(seed=args.seed)
+    asyncio.run(orchestrator.generate_resumes(num_resumes=args.num))
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
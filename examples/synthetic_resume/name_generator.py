@@ -1,38 +1,55 @@
 import random
+from typing import List, Optional
+
+_FIRST_NAMES = (
+    "James", "Emma", "Michael", "Sophia", "William", "Olivia", "Alexander", "Ava",
+    "Daniel", "Isabella", "David", "Mia", "Joseph", "Charlotte", "Andrew", "Amelia",
+    "John", "Harper", "Christopher", "Evelyn", "Matthew", "Abigail", "Joshua", "Emily",
+    "Ryan", "Elizabeth", "Nathan", "Sofia", "Kevin", "Avery", "Justin", "Ella",
+    "Brandon", "Scarlett", "Samuel", "Victoria", "Benjamin", "Madison", "Jonathan", "Luna",
+    "Ethan", "Grace", "Aaron", "Chloe", "Adam", "Penelope", "Brian", "Layla",
+    "Tyler", "Riley", "Zachary", "Zoey", "Scott", "Nora", "Jeremy", "Lily",
+    "Stephen", "Eleanor", "Kyle", "Hannah", "Eric", "Lillian", "Peter", "Addison"
+)
+
+_LAST_NAMES = (
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+    "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas",
+    "Taylor", "Moore", "Jackson", "Martin", "Lee", "Perez", "Thompson", "White",
+    "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson", "Walker", "Young",
+    "Allen", "King", "Wright", "Scott", "Torres", "Nguyen", "Hill", "Flores",
+    "Green", "Adams", "Nelson", "Baker", "Hall", "Rivera", "Campbell", "Mitchell",
+    "Carter", "Roberts", "Chen", "Zhang", "Kumar", "Singh", "Shah", "Patel",
+    "Murphy", "Cook", "Rogers", "Morgan", "Peterson", "Cooper", "Reed", "Bailey"
+)
 
 class NameGenerator:
     """Utility class for generating unique names"""
     
-    def __init__(self):
-        self.first_names = [
-            "James", "Emma", "Michael", "Sophia", "William", "Olivia", "Alexander", "Ava",
-            "Daniel", "Isabella", "David", "Mia", "Joseph", "Charlotte", "Andrew", "Amelia",
-            "John", "Harper", "Christopher", "Evelyn", "Matthew", "Abigail", "Joshua", "Emily",
-            "Ryan", "Elizabeth", "Nathan", "Sofia", "Kevin", "Avery", "Justin", "Ella",
-            "Brandon", "Scarlett", "Samuel", "Victoria", "Benjamin", "Madison", "Jonathan", "Luna",
-            "Ethan", "Grace", "Aaron", "Chloe", "Adam", "Penelope", "Brian", "Layla",
-            "Tyler", "Riley", "Zachary", "Zoey", "Scott", "Nora", "Jeremy", "Lily",
-            "Stephen", "Eleanor", "Kyle", "Hannah", "Eric", "Lillian", "Peter", "Addison"
-        ]
+    __slots__ = ("first_names", "last_names", "_pool", "_idx")
+    
+    def __init__(self, seed: Optional[int] = None):
+        self.first_names = _FIRST_NAMES
+        self.last_names = _LAST_NAMES
         
-        self.last_names = [
-            "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
-            "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas",
-            "Taylor", "Moore", "Jackson", "Martin", "Lee", "Perez", "Thompson", "White",
-            "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson", "Walker", "Young",
-            "Allen", "King", "Wright", "Scott", "Torres", "Nguyen", "Hill", "Flores",
-            "Green", "Adams", "Nelson", "Baker", "Hall", "Rivera", "Campbell", "Mitchell",
-            "Carter", "Roberts", "Chen", "Zhang", "Kumar", "Singh", "Shah", "Patel",
-            "Murphy", "Cook", "Rogers", "Morgan", "Peterson", "Cooper", "Reed", "Bailey"
-        ]
-        self.used_names = set()
+        # Shuffle every first/last combination once so names are drawn without collisions;
+        # a fixed seed gives the same names, and so the same prompts, on every run
+        self._pool = [f"{first} {last}" for first in self.first_names for last in self.last_names]
+        random.Random(seed).shuffle(self._pool)
+        self._idx = 0
     
     def get_unique_name(self) -> str:
         """Generate a unique name that hasn't been used before"""
-        while True:
-            first = random.choice(self.first_names)
-            last = random.choice(self.last_names)
-            full_name = f"{first} {last}"
-            if full_name not in self.used_names:
-                self.used_names.add(full_name)
-                return full_name 
\ No newline at end of file
+        if self._idx == len(self._pool):
+            raise ValueError(f"All {len(self._pool)} unique names have been used")
+        name = self._pool[self._idx]
+        self._idx += 1
+        return name
+
+    def get_unique_names(self, count: int) -> List[str]:
+        """Generate a batch of unique names that haven't been used before"""
+        if self._idx + count > len(self._pool):
+            raise ValueError(f"Only {len(self._pool) - self._idx} unique names are left, {count} requested")
+        names = self._pool[self._idx:self._idx + count]
+        self._idx += count
+        return names 
\ No newline at end of file
@@ -1,27 +1,89 @@
 import random
 from fpdf import FPDF
 from fpdf.enums import XPos, YPos
+from fpdf.fonts import CoreFont
 import os
-from typing import Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 import re
 from font_config import get_font_style
 
+# Replacements for problematic characters, applied in a single str.translate pass
+_SANITIZE_TABLE = str.maketrans({
+    '\u2022': '-',  # bullet to dash
+    '\u2013': '-',  # en dash
+    '\u2014': '-',  # em dash
+    '\u201c': '"',  # smart quotes
+    '\u201d': '"',  # smart quotes
+    '\u2018': "'",  # smart quotes
+    '\u2019': "'",  # smart quotes
+    '\u2026': '...',  # ellipsis
+})
+
+# Anything still outside the core fonts' latin-1 range is dropped rather than failing the PDF
+_UNENCODABLE_CHARS = re.compile(r'[^\x00-\xff]')
+
+@lru_cache(maxsize=4096)
+def _sanitize_non_ascii(text: str) -> str:
+    """Replace and drop characters the core fonts can't render, cached since skills and technologies repeat"""
+    return _UNENCODABLE_CHARS.sub('', text.translate(_SANITIZE_TABLE))
+
+# Per font style: built-in FPDF family, bullet character and number of skill columns
+_FONT_PROFILES = {
+    'helvetica': ('helvetica', '-', 3),
+    'times': ('times', '-', 3),
+    'arial': ('helvetica', '-', 3),  # Use helvetica as fallback for arial
+    'courier': ('courier', '-', 2),  # Wider characters, so fewer columns
+}
+
+def _wrap_words(text: str, measure: Callable[[str], float], max_width: float) -> Optional[List[str]]:
+    """Greedily wrap text on spaces, measuring each word once
+    
+    Returns None if a single word is wider than a line, since that needs character-level breaking.
+    """
+    space_width = measure(' ')
+    lines = []
+    line = []
+    line_width = 0
+    for word in text.split(' '):
+        word_width = measure(word)
+        if word_width > max_width:
+            return None
+        # Like fpdf's multi_cell, extra spaces never start a new line
+        if word and line and line_width + space_width + word_width > max_width:
+            lines.append(' '.join(line))
+            line = []
+            line_width = 0
+        line_width += (space_width if line else 0) + word_width
+        line.append(word)
+    lines.append(' '.join(line))
+    return lines
+
+def _sanitize_tree(obj: Any, sanitize: Callable[[str], str]) -> Any:
+    """Return a copy of nested dicts/lists with every string sanitized"""
+    if isinstance(obj, str):
+        return sanitize(obj)
+    if isinstance(obj, dict):
+        return {key: _sanitize_tree(value, sanitize) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_sanitize_tree(item, sanitize) for item in obj]
+    return obj
+
 class ResumePDF(FPDF):
     """Custom PDF class for resume generation"""
     
+    # String widths keyed by (family, style, size, text), shared by every resume since
+    # the built-in font metrics never change; FPDF tracks the current style in self.font_style
+    _width_cache: Dict[tuple, float] = {}
+    _WIDTH_CACHE_MAX = 100_000
+    
     def __init__(self, font_style: Dict):
         super().__init__()
-        self.font_style = font_style
-        
-        # Map font names to FPDF built-in fonts
-        font_mapping = {
-            'helvetica': 'helvetica',
-            'times': 'times',
-            'arial': 'helvetica',  # Use helvetica as fallback for arial
-        }
         
-        self.font_family = font_mapping.get(font_style["name"].lower(), 'helvetica')
-        self.bullet = '-'  # Simple dash for bullet points
+        # Map the style's font name to an FPDF built-in font and its layout settings
+        profile = _FONT_PROFILES.get(font_style["name"].lower(), _FONT_PROFILES['helvetica'])
+        self.font_family, self.bullet, self.num_columns = profile
         
         # Set default font
         self.set_font(self.font_family)
@@ -31,56 +93,68 @@ class ResumePDF(FPDF):
 
     def sanitize_text(self, text: str) -> str:
         """Sanitize text to handle special characters"""
-        if not isinstance(text, str):
-            text = str(text)
+        # Plain ASCII has nothing to replace or drop
+        if text.isascii():
+            return text
         
-        # Only replace specific problematic characters
-        replacements = {
-            '•': '-',  # bullet to dash
-            '–': '-',  # en dash
-            '—': '-',  # em dash
-            '"': '"',  # smart quotes
-            '"': '"',  # smart quotes
-            ''': "'",  # smart quotes
-            ''': "'",  # smart quotes
-            '…': '...',  # ellipsis
-        }
-        
-        for old, new in replacements.items():
-            text = text.replace(old, new)
-        
-        return text
+        return _sanitize_non_ascii(text)
+
+    def get_string_width(self, s: str, normalized: bool = False, markdown: bool = False) -> float:
+        """Return the width of a string, memoized per font and size"""
+        key = (self.font_family, self.font_style, self.font_size_pt, s, normalized, markdown)
+        cache = ResumePDF._width_cache
+        width = cache.get(key)
+        if width is None:
+            # Whole lines are cached too, so start over rather than grow without bound
+            if len(cache) >= self._WIDTH_CACHE_MAX:
+                cache.clear()
+            width = cache[key] = self._measure(s, normalized, markdown)
+        return width
+
+    def _measure(self, s: str, normalized: bool, markdown: bool) -> float:
+        """Measure a string, summing the core font's per-character widths directly when possible"""
+        font = self.current_font
+        # Without markdown, stretching or char spacing, fpdf's text fragments add nothing to the plain width table
+        if isinstance(font, CoreFont) and not markdown and self.font_stretching == 100 and not self.char_spacing:
+            try:
+                return sum(map(font.cw.__getitem__, s)) * self.font_size_pt * 0.001 / self.k
+            except KeyError:
+                pass  # Not encodable in the core font; let fpdf raise its usual error
+        return super().get_string_width(s, normalized, markdown)
 
     def header(self):
         """Custom header with consistent font family"""
         self.set_font(self.font_family)
 
     def wrapped_cell(self, w: float, h: float, txt: str, border: int = 0, align: str = 'L', fill: bool = False):
-        """Add a wrapped cell with sanitized text"""
-        # Get the current position
+        """Add a wrapped cell; the text is expected to be sanitized already"""
+        # Get the current column
         x = self.get_x()
-        y = self.get_y()
-        
-        # Sanitize the text before processing
-        txt = self.sanitize_text(txt)
-        
-        # Calculate wrapped lines
-        lines = self.multi_cell(w, h, txt, border, align, fill, split_only=True)
         
-        # Print each line
-        for i, line in enumerate(lines):
-            self.set_xy(x, y + i*h)
-            if i == len(lines) - 1:
-                self.cell(w, h, line, 0, 1, align)
+        # Calculate wrapped lines from cached word widths, leaving newlines and overlong words to fpdf
+        lines = None
+        if '\n' not in txt:
+            max_width = (w or self.w - self.r_margin - x) - 2 * self.c_margin
+            # Most fields fit on one line, so try the whole string before splitting into words
+            if self.get_string_width(txt) <= max_width:
+                lines = [txt]
             else:
-                self.cell(w, h, line, 0, 2, align)
+                lines = _wrap_words(txt, self.get_string_width, max_width)
+        if lines is None:
+            lines = self.multi_cell(w, h, txt, border, align, fill, split_only=True)
+        
+        # Print each line, letting the cell advance the cursor back to this column
+        cell = self.cell
+        for line in lines[:-1]:
+            cell(w, h, line, align=align, new_x=XPos.LEFT, new_y=YPos.NEXT)
+        cell(w, h, lines[-1], align=align, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
 
     def format_skills(self, skills):
         """Format skills into columns for better space usage"""
         # Handle case where skills is already a flat list of strings
         if skills and isinstance(skills[0], str):
             # Sanitize all skills
-            skills = [self.sanitize_text(skill) for skill in skills]
+            skills = [self.sanitize_text(str(skill)) for skill in skills]
         # Handle structured skills case
         elif skills and isinstance(skills[0], dict):
             flattened_skills = []
@@ -90,10 +164,9 @@ class ResumePDF(FPDF):
                         flattened_skills.extend(category['items'])
                     elif 'skills' in category:
                         flattened_skills.extend(category['skills'])
-            skills = [self.sanitize_text(skill) for skill in flattened_skills]
+            skills = [self.sanitize_text(str(skill)) for skill in flattened_skills]
         
-        # For Courier font, use fewer columns due to wider characters
-        num_columns = 2 if self.font_family == 'courier' else 3
+        num_columns = self.num_columns
         
         # Split skills into roughly equal columns
         skills_per_column = (len(skills) + num_columns - 1) // num_columns
@@ -105,6 +178,8 @@ class ResumePDF(FPDF):
 
     def add_dynamic_section(self, title: str, content: Any):
         """Add a dynamic section to the resume"""
+        content = _sanitize_tree(content, self.sanitize_text)
+        title = self.sanitize_text(title)
         self.ln(5)
         self.set_font(self.font_family, 'B', 12)
         self.cell(0, 10, title, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
@@ -132,29 +207,27 @@ def create_pdf(resume_data: Dict, output_path: str) -> bool:
     pdf = ResumePDF(font_style)
     pdf.add_page()
     
+    # Sanitize every string once up front so the drawing code can use them as-is
+    resume_data = _sanitize_tree(resume_data, pdf.sanitize_text)
+    
+    personal_info = resume_data["personal_info"]
+    family, bullet = pdf.font_family, pdf.bullet
+    body_size = font_style["body_size"]
+    section_size = font_style["section_size"]
+    
     # Personal Information - Name
-    pdf.set_font(pdf.font_family, 'B', font_style["header_size"])
-    pdf.cell(0, 10, resume_data["personal_info"]["name"], align='C', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.set_font(family, 'B', font_style["header_size"])
+    pdf.cell(0, 10, personal_info["name"], align='C', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     
     # Contact Information - Split into two lines if needed
-    pdf.set_font(pdf.font_family, '', font_style["body_size"])
+    pdf.set_font(family, '', body_size)
     
     # First line: Email, Phone, Location
-    line1_items = [
-        resume_data["personal_info"]["email"],
-        resume_data["personal_info"]["phone"],
-        resume_data["personal_info"]["location"]
-    ]
-    pdf.cell(0, 5, " | ".join(line1_items), align='C', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    contact_line = f'{personal_info["email"]} | {personal_info["phone"]} | {personal_info["location"]}'
+    pdf.cell(0, 5, contact_line, align='C', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     
-    # Second line: LinkedIn, GitHub, Portfolio
-    line2_items = []
-    if resume_data["personal_info"].get("linkedin"):
-        line2_items.append(resume_data["personal_info"]["linkedin"])
-    if resume_data["personal_info"].get("github"):
-        line2_items.append(resume_data["personal_info"]["github"])
-    if resume_data["personal_info"].get("portfolio"):
-        line2_items.append(resume_data["personal_info"]["portfolio"])
+    # Second line: whichever of LinkedIn, GitHub, Portfolio are set
+    line2_items = [link for key in ("linkedin", "github", "portfolio") if (link := personal_info.get(key))]
     
     if line2_items:
         pdf.cell(0, 5, " | ".join(line2_items), align='C', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
@@ -162,26 +235,26 @@ def create_pdf(resume_data: Dict, output_path: str) -> bool:
     # Summary
     if resume_data.get("summary"):
         pdf.ln(3)
-        pdf.set_font(pdf.font_family, 'B', font_style["section_size"])
+        pdf.set_font(family, 'B', section_size)
         pdf.cell(0, 8, "Summary", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-        pdf.set_font(pdf.font_family, '', font_style["body_size"])
+        pdf.set_font(family, '', body_size)
         pdf.wrapped_cell(0, 5, resume_data["summary"])
     
     # Experience
     if resume_data.get("experience"):
         pdf.ln(3)
-        pdf.set_font(pdf.font_family, 'B', font_style["section_size"])
+        pdf.set_font(family, 'B', section_size)
         pdf.cell(0, 8, "Experience", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         
         for exp in resume_data["experience"]:
-            pdf.set_font(pdf.font_family, 'B', font_style["body_size"])
+            pdf.set_font(family, 'B', body_size)
             pdf.cell(0, 5, f"{exp['title']} - {exp['company']}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-            pdf.set_font(pdf.font_family, 'I', font_style["body_size"])
+            pdf.set_font(family, 'I', body_size)
             pdf.cell(0, 5, f"{exp['location']} | {exp['start_date']} - {exp['end_date']}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-            pdf.set_font(pdf.font_family, '', font_style["body_size"])
+            pdf.set_font(family, '', body_size)
             
             for resp in exp["responsibilities"]:
-                pdf.wrapped_cell(0, 5, f"{pdf.bullet} {resp}")
+                pdf.wrapped_cell(0, 5, f"{bullet} {resp}")
             
             if exp.get("technologies"):
                 pdf.wrapped_cell(0, 5, f"Technologies: {', '.join(exp['technologies'])}")
@@ -190,15 +263,15 @@ def create_pdf(resume_data: Dict, output_path: str) -> bool:
     # Education
     if resume_data.get("education"):
         pdf.ln(3)
-        pdf.set_font(pdf.font_family, 'B', font_style["section_size"])
+        pdf.set_font(family, 'B', section_size)
         pdf.cell(0, 8, "Education", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         
         for edu in resume_data["education"]:
-            pdf.set_font(pdf.font_family, 'B', font_style["body_size"])
+            pdf.set_font(family, 'B', body_size)
             pdf.cell(0, 5, f"{edu['degree']} in {edu['field']}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-            pdf.set_font(pdf.font_family, 'I', font_style["body_size"])
+            pdf.set_font(family, 'I', body_size)
             pdf.cell(0, 5, f"{edu['university']} | {edu['location']} | {edu['year']} | GPA: {edu['gpa']}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-            pdf.set_font(pdf.font_family, '', font_style["body_size"])
+            pdf.set_font(family, '', body_size)
             if edu.get("relevant_coursework"):
                 pdf.wrapped_cell(0, 5, f"Relevant Coursework: {', '.join(edu['relevant_coursework'])}")
             pdf.ln(2)  # Small space between education entries
@@ -206,26 +279,32 @@ def create_pdf(resume_data: Dict, output_path: str) -> bool:
     # Skills
     if resume_data.get("skills"):
         pdf.ln(3)
-        pdf.set_font(pdf.font_family, 'B', font_style["section_size"])
+        pdf.set_font(family, 'B', section_size)
         pdf.cell(0, 8, "Skills", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         
         # Set font for skills
-        pdf.set_font(pdf.font_family, '', font_style["body_size"])
+        pdf.set_font(family, '', body_size)
         
         # Join all skills with commas
         skills_text = ", ".join(resume_data["skills"])
         
-        # Handle long skill lists with wrapping
+        # Handle long skill lists with wrapping, tracking the line width from per-word widths
         words = skills_text.split(", ")
+        max_width = pdf.w - pdf.l_margin - pdf.r_margin
+        measure = pdf.get_string_width
+        sep_width = measure(", ")
         current_line = []
+        line_width = 0
         
         for word in words:
-            current_line.append(word)
-            test_line = ", ".join(current_line)
-            if pdf.get_string_width(test_line) > (pdf.w - pdf.l_margin - pdf.r_margin):
+            word_width = measure(word)
+            if current_line and line_width + sep_width + word_width > max_width:
                 # Print current line and start new one
-                pdf.cell(0, 5, ", ".join(current_line[:-1]), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-                current_line = [word]
+                pdf.cell(0, 5, ", ".join(current_line), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+                current_line = []
+                line_width = 0
+            line_width += (sep_width if current_line else 0) + word_width
+            current_line.append(word)
         
         # Print remaining skills
         if current_line:
@@ -236,44 +315,53 @@ def create_pdf(resume_data: Dict, output_path: str) -> bool:
     # Publications for ML/AI roles
     if resume_data.get("publications"):
         pdf.ln(3)
-        pdf.set_font(pdf.font_family, 'B', font_style["section_size"])
+        pdf.set_font(family, 'B', section_size)
         pdf.cell(0, 8, "Publications", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         
         for pub in resume_data["publications"]:
             if isinstance(pub, dict):
-                pdf.set_font(pdf.font_family, 'B', font_style["body_size"])
-                pdf.wrapped_cell(0, 5, f"{pdf.bullet} {pdf.sanitize_text(pub['title'])}")
-                pdf.set_font(pdf.font_family, '', font_style["body_size"])
-                if pub.get("authors"):
-                    pdf.wrapped_cell(0, 5, f"    Authors: {pdf.sanitize_text(', '.join(pub['authors']))}")
+                pdf.set_font(family, 'B', body_size)
+                pdf.wrapped_cell(0, 5, f"{bullet} {pub['title']}")
+                pdf.set_font(family, '', body_size)
+                authors = pub.get("authors")
+                if authors:
+                    if not isinstance(authors, str):
+                        authors = ', '.join(authors)
+                    pdf.wrapped_cell(0, 5, f"    Authors: {authors}")
                 if pub.get("journal"):
-                    pdf.wrapped_cell(0, 5, f"    {pdf.sanitize_text(pub['journal'])} ({pub.get('year', '')})")
+                    pdf.wrapped_cell(0, 5, f"    {pub['journal']} ({pub.get('year') or ''})")
                 if pub.get("link"):
-                    pdf.wrapped_cell(0, 5, f"    Link: {pdf.sanitize_text(pub['link'])}")
+                    pdf.wrapped_cell(0, 5, f"    Link: {pub['link']}")
             else:
-                pdf.wrapped_cell(0, 5, f"{pdf.bullet} {pdf.sanitize_text(str(pub))}")
+                pdf.wrapped_cell(0, 5, f"{bullet} {str(pub)}")
             pdf.ln(2)  # Small space between publications
     
     # Research Projects
     if resume_data.get("projects"):
         pdf.ln(3)
-        pdf.set_font(pdf.font_family, 'B', font_style["section_size"])
+        pdf.set_font(family, 'B', section_size)
         pdf.cell(0, 8, "Research Projects", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         
         for project in resume_data["projects"]:
             if isinstance(project, dict):
-                pdf.set_font(pdf.font_family, 'B', font_style["body_size"])
-                pdf.wrapped_cell(0, 5, f"{pdf.bullet} {pdf.sanitize_text(project['title'])}")
-                pdf.set_font(pdf.font_family, '', font_style["body_size"])
+                if project.get("title"):
+                    pdf.set_font(family, 'B', body_size)
+                    pdf.wrapped_cell(0, 5, f"{bullet} {project['title']}")
+                pdf.set_font(family, '', body_size)
                 if project.get("description"):
-                    pdf.wrapped_cell(0, 5, f"    {pdf.sanitize_text(project['description'])}")
-                if project.get("technologies"):
-                    pdf.wrapped_cell(0, 5, f"    Technologies: {pdf.sanitize_text(', '.join(project['technologies']))}")
-                if project.get("results"):
-                    for result in project["results"]:
-                        pdf.wrapped_cell(0, 5, f"    - {pdf.sanitize_text(result)}")
+                    pdf.wrapped_cell(0, 5, f"    {project['description']}")
+                technologies = project.get("technologies")
+                if technologies:
+                    if not isinstance(technologies, str):
+                        technologies = ', '.join(technologies)
+                    pdf.wrapped_cell(0, 5, f"    Technologies: {technologies}")
+                results = project.get("results")
+                if results:
+                    # A single result may come back as a plain string rather than a list
+                    for result in [results] if isinstance(results, str) else results:
+                        pdf.wrapped_cell(0, 5, f"    - {result}")
             else:
-                pdf.wrapped_cell(0, 5, f"{pdf.bullet} {pdf.sanitize_text(str(project))}")
+                pdf.wrapped_cell(0, 5, f"{bullet} {str(project)}")
             pdf.ln(2)  # Small space between projects
     
     try:
@@ -281,4 +369,16 @@ def create_pdf(resume_data: Dict, output_path: str) -> bool:
         return True
     except Exception as e:
         print(f"Error generating PDF: {e}")
-        return False 
\ No newline at end of file
+        return False 
+
+def _create_pdf_job(job: Tuple[Dict, str]) -> bool:
+    """Unpack a (resume_data, output_path) pair for create_pdf in a worker process"""
+    return create_pdf(*job)
+
+def create_pdfs_bulk(jobs: List[Tuple[Dict, str]], workers: Optional[int] = None) -> Iterator[bool]:
+    """Create many PDFs across worker processes, yielding success status per (resume_data, output_path) pair in order
+    
+    Rendering is CPU-bound pure Python, so threads would serialize on the GIL.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_create_pdf_job, jobs)
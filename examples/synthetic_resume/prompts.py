@@ -52,12 +52,13 @@ def generate_user_prompt(role_variation: dict) -> str:
     tech_stack = role_variation['tech_stack']
     years = role_variation['years']
     
-    return f"""Please create a realistic resume for {name}, a {level} {role} with {years} years of experience. 
-Their focus is on {focus} using {tech_stack}. 
+    # Static instructions come first so requests share the longest possible prefix for provider-side prompt caching
+    return f"""Please create a realistic resume formatted as a JSON object that matches the schema defined in the system prompt.
 The resume should include:
 1. Relevant work experience with specific achievements and metrics
-2. Education background appropriate for their role and level
-3. Technical skills aligned with their focus area
+2. Education background appropriate for the candidate's role and level
+3. Technical skills aligned with the candidate's focus area
 4. Professional certifications if applicable
 
-Please format the response as a JSON object that matches the schema defined in the system prompt.""" 
\ No newline at end of file
+The candidate is {name}, a {level} {role} with {years} years of experience.
+Their focus is on {focus} using {tech_stack}.""" 
\ No newline at end of file
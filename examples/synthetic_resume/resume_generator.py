@@ -3,16 +3,26 @@ import json
 import os
 import re
 import argparse
-from typing import List, Dict
+from functools import lru_cache
+from typing import List, Dict, Optional
 from datetime import datetime
 from dotenv import load_dotenv
+from tqdm import tqdm
+from pydantic import ValidationError
 from bespokelabs import curator
 from prompts import RESUME_SYSTEM_PROMPT, generate_user_prompt
 
 from datamodels import Resume
 from name_generator import NameGenerator
 from role_generator import RoleGenerator
-from pdf_generator import create_pdf
+from pdf_generator import create_pdfs_bulk
+from file_utils import safe_filename, write_json
+
+try:
+    # orjson parses the LLM output several times faster; its JSONDecodeError subclasses json's
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 # Load environment variables from .env file
 load_dotenv()
@@ -23,6 +33,99 @@ if not os.getenv("DEEPSEEK_API_KEY"):
 
 logger = logging.getLogger(__name__)
 
+_DEFAULT_ROLE_VARIATION = {
+    'role': 'Software Engineer',
+    'level': 'Mid-level',
+    'focus': 'Full-stack development',
+    'tech_stack': 'Python, JavaScript, and cloud technologies',
+    'years': '4-6'
+}
+_DEFAULT_SECTIONS = ("summary", "experience", "education", "skills")
+
+# Schema fragments for the system prompt
+_PERSONAL_INFO_SCHEMA = {
+    "name": "string",
+    "email": "string",
+    "phone": "string",
+    "location": "string",
+    "linkedin": "string",
+    "github": "string (optional)",
+    "portfolio": "string (optional)"
+}
+_CORE_SECTION_SCHEMAS = {
+    "summary": "string",
+    "experience": [{
+        "title": "string",
+        "company": "string",
+        "location": "string",
+        "start_date": "string",
+        "end_date": "string",
+        "responsibilities": ["string"],
+        "technologies": ["string"]
+    }],
+    "education": [{
+        "degree": "string",
+        "field": "string",
+        "university": "string",
+        "location": "string",
+        "year": "number",
+        "gpa": "number",
+        "relevant_coursework": ["string"]
+    }],
+    "skills": ["string"],
+}
+_PUBLICATIONS_SCHEMA = [{
+    "title": "string",
+    "authors": ["string"],
+    "journal": "string",
+    "year": "number",
+    "link": "string (optional)",
+    "impact_factor": "number (optional)",
+    "citations": "number (optional)"
+}]
+
+@lru_cache(maxsize=64)
+def _system_prompt(sections: tuple, requires_publications: bool) -> str:
+    """Build the system prompt for a section layout, once per distinct layout
+    
+    Variations share a handful of layouts, so every request with the same layout gets the
+    identical prompt string, which also keeps the provider-side prompt cache warm.
+    """
+    # Build dynamic schema based on sections; the fragments are shared since they are only serialized
+    schema = {"personal_info": _PERSONAL_INFO_SCHEMA}
+    
+    # Add required sections
+    for section in sections:
+        if section in _CORE_SECTION_SCHEMAS:
+            schema[section] = _CORE_SECTION_SCHEMAS[section]
+        elif section == "publications" or requires_publications:
+            schema["publications"] = _PUBLICATIONS_SCHEMA
+        # ... other sections ...
+
+    # Build the system prompt with emphasis on publications for ML/AI roles
+    system_prompt = f"""You are a professional resume writer. Create a realistic and detailed tech industry resume.
+        Your response must be a valid JSON object that follows this exact structure:
+        
+        {json.dumps(schema, indent=2)}
+        
+        Ensure:
+        1. All dates are in YYYY-MM format
+        2. GPA is a number between 0.0 and 4.0
+        3. Year is a four-digit number
+        4. All arrays must contain at least one item
+        """
+    
+    if requires_publications:
+        system_prompt += """
+        5. For this ML/AI role, you MUST include at least 2 relevant publications
+        6. Publications should be realistic and related to the role's focus area
+        7. Include both conference and journal publications if possible
+        """
+    
+    system_prompt += "\nReturn only the JSON object, no additional text."
+    
+    return system_prompt
+
 class ResumeGenerator(curator.LLM):
     """A resume generator that creates realistic tech industry resumes"""
     
@@ -34,7 +137,11 @@ class ResumeGenerator(curator.LLM):
             backend_params={
                 "max_requests_per_minute": 10000,
                 "max_tokens_per_minute": 10000000,
+                # DeepSeek slows down clients that flood it rather than returning 429s, so cap requests in flight
+                "max_concurrent_requests": 64,
                 "request_timeout": 30 * 60,
+                # Drop rows that still fail after retries instead of raising, so one bad row doesn't sink the batch
+                "require_all_responses": False,
             },
             generation_params={
                 "temperature": 0.7,
@@ -42,176 +149,111 @@ class ResumeGenerator(curator.LLM):
             }
         )
 
-    def __call__(self, dataset: List[Dict]) -> List[Dict]:
-        """Generate resume data from role variation"""
+    def __call__(self, dataset: List[Dict]) -> List[Optional[Dict]]:
+        """Generate resume data for all role variations in a single batched request
+        
+        Returns a list aligned with the input dataset, with None where generation failed.
+        """
+        results = [None] * len(dataset)
         try:
-            # Generate prompt
-            messages = self.prompt(dataset[0])
-            
-            # Make LLM call using self directly since we inherit from curator.LLM
-            response = super().__call__([{"messages": messages}])
-            logger.info(f"LLM response received: {response}")
+            # Tag each row with its position since curator drops rows whose request failed
+            rows = [{**row, 'row_idx': i} for i, row in enumerate(dataset)]
+            response = super().__call__(rows)
+            logger.info(f"LLM responses received: {len(response)}")
             
-            # Parse response
-            result = self.parse_response(response)
-            if not result:
-                logger.error("Failed to parse LLM response")
-                return []
-                
-            return result
+            for row in response:
+                results[row['row_idx']] = json_loads(row['resume'])
             
         except Exception as e:
             logger.error(f"Error in resume generation: {str(e)}")
-            return []
+        
+        return results
 
     def prompt(self, input: dict) -> List[dict]:
         """Generate the prompt as a list of messages"""
-        role_variation = input.get('role_variation', {
-            'role': 'Software Engineer',
-            'level': 'Mid-level',
-            'focus': 'Full-stack development',
-            'tech_stack': 'Python, JavaScript, and cloud technologies',
-            'years': '4-6'
-        })
+        role_variation = input.get('role_variation', _DEFAULT_ROLE_VARIATION)
         
-        # Get recommended sections
-        sections = role_variation.get('recommended_sections', ["summary", "experience", "education", "skills"])
-        requires_publications = role_variation.get('requires_publications', False)
+        # Get recommended sections (batched rows carry None for keys other variations set)
+        sections = role_variation.get('recommended_sections') or _DEFAULT_SECTIONS
+        requires_publications = role_variation.get('requires_publications') or False
         
-        # Build dynamic schema based on sections
-        schema = {
-            "personal_info": {
-                "name": "string",
-                "email": "string",
-                "phone": "string",
-                "location": "string",
-                "linkedin": "string",
-                "github": "string (optional)",
-                "portfolio": "string (optional)"
-            }
-        }
-        
-        # Add required sections
-        for section in sections:
-            if section == "summary":
-                schema["summary"] = "string"
-            elif section == "experience":
-                schema["experience"] = [{
-                    "title": "string",
-                    "company": "string",
-                    "location": "string",
-                    "start_date": "string",
-                    "end_date": "string",
-                    "responsibilities": ["string"],
-                    "technologies": ["string"]
-                }]
-            elif section == "education":
-                schema["education"] = [{
-                    "degree": "string",
-                    "field": "string",
-                    "university": "string",
-                    "location": "string",
-                    "year": "number",
-                    "gpa": "number",
-                    "relevant_coursework": ["string"]
-                }]
-            elif section == "skills":
-                schema["skills"] = ["string"]
-            elif section == "publications" or requires_publications:
-                schema["publications"] = [{
-                    "title": "string",
-                    "authors": ["string"],
-                    "journal": "string",
-                    "year": "number",
-                    "link": "string (optional)",
-                    "impact_factor": "number (optional)",
-                    "citations": "number (optional)"
-                }]
-            # ... other sections ...
+        return [
+            {"role": "system", "content": _system_prompt(tuple(sections), bool(requires_publications))},
+            {"role": "user", "content": generate_user_prompt(role_variation)}
+        ]
 
-        # Build the system prompt with emphasis on publications for ML/AI roles
-        system_prompt = f"""You are a professional resume writer. Create a realistic and detailed tech industry resume.
-        Your response must be a valid JSON object that follows this exact structure:
-        
-        {json.dumps(schema, indent=2)}
+    def parse(self, input: dict, response: Dict) -> List[Dict]:
+        """Parse a completion into a resume row, dropping the row if it cannot be parsed"""
+        result = self.parse_response(response)
+        if not result:
+            logger.error(f"Failed to parse LLM response for row {input['row_idx']}")
+            return []
         
-        Ensure:
-        1. All dates are in YYYY-MM format
-        2. GPA is a number between 0.0 and 4.0
-        3. Year is a four-digit number
-        4. All arrays must contain at least one item
-        """
+        # Store the resume as JSON since optional sections vary too much for a fixed Arrow schema;
+        # unset optional fields are left out rather than saved and rendered as null
+        return [{'row_idx': input['row_idx'], 'resume': result[0].model_dump_json(exclude_none=True)}]
+
+    @staticmethod
+    def _normalize_resume_data(resume_data: Dict) -> Dict:
+        """Coerce common deviations from the schema, such as categorized skills, into the expected shape"""
+        # Ensure skills is a simple list of strings
+        if 'skills' in resume_data:
+            if isinstance(resume_data['skills'], dict):
+                # If it's a dict with items, extract the items
+                resume_data['skills'] = resume_data['skills'].get('items', [])
+            elif isinstance(resume_data['skills'], list):
+                # If it's a list of dicts, extract just the skill strings
+                if resume_data['skills'] and isinstance(resume_data['skills'][0], dict):
+                    all_skills = []
+                    for category in resume_data['skills']:
+                        if isinstance(category, dict):
+                            all_skills.extend(category.get('items', []))
+                    resume_data['skills'] = all_skills
+        else:
+            resume_data['skills'] = []
         
-        if requires_publications:
-            system_prompt += """
-        5. For this ML/AI role, you MUST include at least 2 relevant publications
-        6. Publications should be realistic and related to the role's focus area
-        7. Include both conference and journal publications if possible
-        """
+        # Ensure required top-level fields exist
+        required_fields = ['personal_info', 'summary', 'experience', 'education', 'skills']
+        for field in required_fields:
+            if field not in resume_data:
+                logger.error(f"Missing required field: {field}")
+                resume_data[field] = {} if field == 'personal_info' else []
         
-        system_prompt += "\nReturn only the JSON object, no additional text."
-
-        return [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": generate_user_prompt(role_variation)}
-        ]
+        return resume_data
 
-    def parse_response(self, response: Dict) -> List[Dict]:
-        """Parse LLM response into resume data"""
+    def parse_response(self, response: Dict) -> List[Resume]:
+        """Parse LLM response into a validated resume"""
         try:
-            # Handle Dataset response
-            if hasattr(response, 'to_dict'):
-                response_dict = response[0]
-                content = response_dict['choices'][0]['message']['content']
-            else:
-                content = response.get('choices', [{}])[0].get('message', {}).get('content', '')
+            content = response.get('choices', [{}])[0].get('message', {}).get('content', '')
             
-            logger.info(f"Raw content before cleaning: {content}")
+            # Payload dumps are debug-only and lazily formatted so they cost nothing when disabled
+            logger.debug("Raw content before cleaning: %s", content)
             
-            # Clean the content
-            content = content.replace('```json', '').replace('```', '').strip()
-            content = content.encode('ascii', 'ignore').decode('ascii')
+            # Keep just the outermost JSON object, dropping code fences and any prose around it
+            start, end = content.find('{'), content.rfind('}')
+            content = content[start:end + 1] if 0 <= start < end else content.strip()
             
-            logger.info(f"Cleaned content: {content}")
+            logger.debug("Cleaned content: %s", content)
             
             try:
-                # Parse JSON
-                resume_data = json.loads(content)
-                logger.info(f"Parsed JSON: {json.dumps(resume_data, indent=2)}")
-                
-                # Ensure skills is a simple list of strings
-                if 'skills' in resume_data:
-                    if isinstance(resume_data['skills'], dict):
-                        # If it's a dict with items, extract the items
-                        resume_data['skills'] = resume_data['skills'].get('items', [])
-                    elif isinstance(resume_data['skills'], list):
-                        # If it's a list of dicts, extract just the skill strings
-                        if resume_data['skills'] and isinstance(resume_data['skills'][0], dict):
-                            all_skills = []
-                            for category in resume_data['skills']:
-                                if isinstance(category, dict):
-                                    all_skills.extend(category.get('items', []))
-                            resume_data['skills'] = all_skills
-                else:
-                    resume_data['skills'] = []
-                
-                # Ensure required top-level fields exist
-                required_fields = ['personal_info', 'summary', 'experience', 'education', 'skills']
-                for field in required_fields:
-                    if field not in resume_data:
-                        logger.error(f"Missing required field: {field}")
-                        resume_data[field] = {} if field == 'personal_info' else []
-                
-                # Validate against model
-                resume = Resume(**resume_data)
-                result = resume.dict()
-                logger.info(f"Validated resume data: {json.dumps(result, indent=2)}")
+                try:
+                    # Well-formed output is parsed and validated in one pass, without an intermediate dict
+                    resume = Resume.model_validate_json(content)
+                except ValidationError:
+                    # Otherwise normalize the parsed data and validate again
+                    resume_data = json_loads(content)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Parsed JSON: %s", json.dumps(resume_data, indent=2))
+                    resume = Resume.model_validate(self._normalize_resume_data(resume_data))
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Validated resume data: %s", resume.model_dump_json(indent=2))
                 
-                return [result]
+                # Keep the model so it serializes straight to JSON without an intermediate dict
+                return [resume]
                 
             except json.JSONDecodeError as e:
                 logger.error(f"JSON parsing error: {str(e)}")
-                logger.debug(f"Content that failed to parse: {content}")
+                logger.debug("Content that failed to parse: %s", content)
                 return []
                 
         except Exception as e:
@@ -226,6 +268,8 @@ def main():
     parser = argparse.ArgumentParser(description='Generate synthetic resumes using DeepSeek API')
     parser.add_argument('-n', '--num_resumes', type=int, default=1,
                       help='Number of resumes to generate (default: 1)')
+    parser.add_argument('--seed', type=int, default=None,
+                      help='Seed for name assignment; rerunning with the same seed and -n reuses cached LLM responses')
     args = parser.parse_args()
     
     print(f"Initializing ResumeGenerator to create {args.num_resumes} resumes...")
@@ -235,71 +279,57 @@ def main():
         resume_generator = ResumeGenerator()
         print("Debug: ResumeGenerator instance created successfully")
         
-        # Create base output directory
+        # Create the timestamped subfolder for this run, along with the base output directory if needed
         base_output_dir = "generated_resumes"
-        if not os.path.exists(base_output_dir):
-            os.makedirs(base_output_dir)
-            print(f"Created base output directory: {base_output_dir}")
-
-        # Create timestamped subfolder for this run
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_dir = os.path.join(base_output_dir, f"attempt_{timestamp}")
-        os.makedirs(output_dir)
+        os.makedirs(output_dir, exist_ok=True)
         print(f"Created output directory for this run: {output_dir}")
 
         # Initialize generators
         role_generator = RoleGenerator()
-        name_generator = NameGenerator()
+        name_generator = NameGenerator(seed=args.seed)
         
-        # Get role variations based on requested number
+        # Get role variations based on requested number and name them up front
         variations = role_generator.get_variations(args.num_resumes)
         num_resumes = len(variations)
-        successful = 0
+        for variation, unique_name in zip(variations, name_generator.get_unique_names(num_resumes)):
+            variation['name'] = unique_name
         
-        for i, variation in enumerate(variations):
-            print(f"\nGenerating resume {i+1}/{num_resumes} for {variation['level']} {variation['role']}...")
+        # Generate every resume in one batched call so curator can run the requests concurrently
+        print(f"\nGenerating {num_resumes} resumes...")
+        dataset = resume_generator([{'role_variation': variation} for variation in variations])
+        
+        pdf_jobs = []
+        for i, (variation, resume_data) in enumerate(zip(variations, dataset), 1):
+            if resume_data is None:
+                print(f"No data generated for resume {i} ({variation['level']} {variation['role']})")
+                continue
+            
             try:
-                # Generate a unique name for this resume
-                unique_name = name_generator.get_unique_name()
-                variation['name'] = unique_name
-                
-                # Generate a resume with this variation
-                dataset = resume_generator([{'role_variation': variation}])
-                
-                if not dataset or len(dataset) == 0:
-                    print(f"No data generated for resume {i+1}")
-                    continue
-                    
-                # Extract the resume data
-                resume_data = dataset[0]
-                
                 # Ensure the generated resume uses the unique name
+                unique_name = variation['name']
                 resume_data["personal_info"]["name"] = unique_name
                 
-                # Create a filesystem-safe version of the name
-                safe_name = unique_name.lower().replace(' ', '_')
-                safe_name = re.sub(r'[^a-z0-9_]', '', safe_name)
-                role_name = variation['role'].lower().replace(' ', '_')
+                # Build the shared path prefix from filesystem-safe versions of the name and role
+                path_prefix = os.path.join(output_dir, f"resume_{safe_filename(unique_name)}_{safe_filename(variation['role'])}")
                 
                 # Save as JSON
-                json_path = os.path.join(output_dir, f"resume_{safe_name}_{role_name}.json")
-                print(f"Saving JSON to: {json_path}")
-                with open(json_path, 'w') as f:
-                    json.dump(resume_data, f, indent=2)
+                write_json(resume_data, path_prefix + ".json")
+                
+                pdf_jobs.append((resume_data, path_prefix + ".pdf"))
                 
-                # Generate PDF
-                pdf_path = os.path.join(output_dir, f"resume_{safe_name}_{role_name}.pdf")
-                print(f"Generating PDF: {pdf_path}")
-                if create_pdf(resume_data, pdf_path):
-                    print(f"Successfully generated resume {i+1}")
-                    print(f"Files created:\n- {json_path}\n- {pdf_path}")
-                    successful += 1
-                else:
-                    print(f"Failed to create PDF for resume {i+1}")
-                    
             except Exception as e:
-                print(f"Error generating resume {i+1}: {str(e)}")
-                continue
+                print(f"Error saving resume {i}: {str(e)}")
+        
+        # Render the PDFs in parallel worker processes, reporting progress as they finish
+        successful = 0
+        results = create_pdfs_bulk(pdf_jobs)
+        for (_, pdf_path), created in tqdm(zip(pdf_jobs, results), total=len(pdf_jobs), desc="Rendering PDFs"):
+            if created:
+                successful += 1
+            else:
+                tqdm.write(f"Failed to create PDF: {pdf_path}")
         
         # Print summary
         print(f"\nGeneration complete!")